@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import logging
+from src.utils import downcast_frame
 
 class TennisDataCombiner:
     """
@@ -16,89 +17,72 @@ class TennisDataCombiner:
             labels (list or np.ndarray): The corresponding labels for the data.
         """
 
-        # Load participants from a CSV file if available
+        # Load participants and games from Parquet files if available
         try:
-            self.participants = pd.read_csv("data/processed/participants.csv")
-            self.games = pd.read_csv("data/processed/games.csv")
+            self.participants = pd.read_parquet("data/processed/participants.parquet")
+            self.games = pd.read_parquet("data/processed/games.parquet")
         except FileNotFoundError as e:
             logging.error("Participants or games data file not found. Please ensure the files exist in the specified path.", e)
 
     def participant_features(self):
-        part_df = self.participants.copy()
-        np.random.seed(42)
-        num_participants = part_df.shape[0]
-        random_birthdates = pd.to_datetime(
-            np.random.randint(
-                pd.Timestamp("1970-01-01").value // 10**9,
-                pd.Timestamp("2005-12-31").value // 10**9,
-                num_participants
-            ),
-            unit='s'
-        ).normalize()  # Set time to 00:00:00
-        part_df['birthdate'] = random_birthdates
-        return part_df
+        rng = np.random.default_rng(42)
+        num_participants = self.participants.shape[0]
+        start = np.datetime64("1970-01-01", "D")
+        end = np.datetime64("2005-12-31", "D")
+        # Whole days, so the time is already 00:00:00
+        random_birthdates = start + rng.integers(0, (end - start).astype(int), num_participants).astype('timedelta64[D]')
+        return self.participants.assign(birthdate=random_birthdates)
 
     def symmetrize_games(self, df):
         # Symmetrize matches: add a row for each match with home/away swapped and result reversed
-        def reverse_result(result):
-            # Handles results like '3:1', '2:3', etc.
-            if isinstance(result, str) and ':' in result:
-                parts = result.split(':')
-                return f"{parts[1]}:{parts[0]}"
-            return result
-
-        df_train_sym = df.copy()
-        swapped = df.copy()
-        # Swap all columns containing 'home' with their corresponding 'away' columns and vice versa
+        # Swapping is done by renaming every 'home' column to its 'away' counterpart and vice versa
+        rename_map = {}
         for col in df.columns:
-            if 'home' in col:
-                away_col = col.replace('home', 'away')
-                if away_col in df.columns:
-                    swapped[col], swapped[away_col] = df[away_col], df[col]
-            elif 'away' in col:
-                home_col = col.replace('away', 'home')
-                if home_col in df.columns:
-                    swapped[col], swapped[home_col] = df[home_col], df[col]
+            swapped_col = col.replace('home', '\x00').replace('away', 'home').replace('\x00', 'away')
+            if swapped_col != col and swapped_col in df.columns:
+                rename_map[col] = swapped_col
+        swapped = df.rename(columns=rename_map, copy=False)
 
-        swapped['result'] = df['result'].apply(reverse_result)
+        # Handles results like '3:1', '2:3', etc.
+        swapped['result'] = df['result'].str.replace(r'^(\d+):(\d+)$', r'\2:\1', regex=True)
 
         # Concatenate original and swapped
         df_train_sym = pd.concat([df, swapped], ignore_index=True)
-        df_train_sym.reset_index(drop=True, inplace=True)
 
         logging.info(f"Original matches: {len(df)}, Symmetrized matches: {len(df_train_sym)}")
         return df_train_sym
 
-    def combine_data(self):
+    def combine_data(self, export_csv: bool = False):
         """
         Combine data from participants and games into a single DataFrame.
+
+        Args:
+            export_csv: Also export the combined data to data/processed/combined.csv.
         """
-        game_df = self.games.copy()
+        game_df = self.games
         part_df = self.participant_features()[['id', 'name', 'birthdate']]
 
-        # Merge the two DataFrames on 'id'
-        combined_df = pd.merge(
-            game_df, 
-            part_df.add_suffix('_home'),  # Add suffix to all columns in right table
-            left_on='home_id', 
-            right_on='id_home', 
-            suffixes=('', ''), 
-            how='inner'
-        )
-        combined_df = pd.merge(
-            combined_df, 
-            part_df.add_suffix('_away'),  # Add suffix to all columns in right table
-            left_on='away_id', 
-            right_on='id_away', 
-            suffixes=('', ''), 
-            how='inner'
-        )
-
-        sym_df = self.symmetrize_games(combined_df)
-
-        sym_df.to_csv("data/processed/combined.csv", index=False)
-        
-        logging.info("Features saved to data/processed/combined.csv")
+        # Index participants by id once and look up both sides, instead of merging twice
+        part_idx = part_df.drop_duplicates(subset='id').set_index('id')
+        known = game_df['home_id'].isin(part_idx.index) & game_df['away_id'].isin(part_idx.index)
+        combined_df = game_df[known]
+
+        participant_columns = {}
+        for side in ('home', 'away'):
+            ids = combined_df[f'{side}_id'].astype(part_idx.index.dtype)
+            participant_columns[f'id_{side}'] = ids
+            participant_columns[f'name_{side}'] = ids.map(part_idx['name'])
+            participant_columns[f'birthdate_{side}'] = ids.map(part_idx['birthdate'])
+        combined_df = combined_df.assign(**participant_columns).reset_index(drop=True)
+
+        sym_df = downcast_frame(self.symmetrize_games(combined_df))
+
+        sym_df.to_parquet("data/processed/combined.parquet", engine='pyarrow', compression='zstd', index=False)
+        logging.info("Features saved to data/processed/combined.parquet")
+
+        if export_csv:
+            sym_df.to_csv("data/processed/combined.csv", index=False)
+            logging.info("Features exported to data/processed/combined.csv")
 
         return sym_df
 
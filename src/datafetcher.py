@@ -1,37 +1,117 @@
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import httpx
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException
 
 logging.basicConfig(level=logging.INFO)
 
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
 class TennisDataFetcher:
     """
     Collects tennis data from the SofaScore API.
     """
-    def __init__(self):
+    def __init__(self, max_workers: int = 8):
         """
         Initializes the TennisDataFetcher object.
+
+        Args:
+            max_workers: Number of requests that are fetched concurrently.
         """
         self.base_url = "https://www.sofascore.com/api/v1"
+        self.max_workers = max_workers
 
-        try:
+        self.client = httpx.Client(
+            headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+            limits=httpx.Limits(max_connections=2 * max_workers),
+            timeout=10,
+        )
+        # Selenium is only started once a plain HTTP request gets blocked
+        self.driver = None
+        self._driver_lock = threading.Lock()
+
+    def _get_driver(self) -> webdriver.Chrome:
+        """
+        Returns the Selenium WebDriver, starting it on first use.
+        """
+        if self.driver is None:
             options = Options()
             options.add_argument('--headless')
             options.add_argument('--disable-gpu')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
             self.driver = webdriver.Chrome(options=options)
-        except Exception as e:
-            logging.error(f"Failed to initialize Selenium WebDriver: {e}")
+        return self.driver
+
+    def _cached_get(self, endpoint: str, cache_path: Optional[str], extract: Callable[[Any], Any]) -> Any:
+        """
+        Fetches an endpoint with the pooled HTTP client and returns extract(response).
+        The extracted payload is cached at cache_path together with the ETag/Last-Modified
+        validators of the response in a .meta.json file. If a cached payload exists, a
+        conditional request is sent and the cached payload is returned when unchanged (304),
+        or when the request fails. Without a cached payload, blocked or failed requests
+        (e.g. by a Cloudflare challenge) fall back to Selenium.
+        """
+        meta_path = os.path.splitext(cache_path)[0] + ".meta.json" if cache_path else None
+        headers = {}
+        if cache_path and os.path.exists(cache_path):
+            if not os.path.exists(meta_path):
+                # Cached without validators (e.g. fetched through Selenium), reuse it as is
+                return self.load_data(cache_path)
+            meta = self.load_data(meta_path)
+            if "ETag" in meta:
+                headers["If-None-Match"] = meta["ETag"]
+            if "Last-Modified" in meta:
+                headers["If-Modified-Since"] = meta["Last-Modified"]
+
+        url = self.base_url + endpoint
+        data = None
+        validators = {}
+        try:
+            response = self.client.get(url, headers=headers)
+            if response.status_code == 304:
+                return self.load_data(cache_path)
+            if response.status_code == 403:
+                logging.warning(f"Request to {url} was blocked")
+            elif response.is_error and cache_path and os.path.exists(cache_path):
+                logging.warning(f"Request to {url} returned status {response.status_code}")
+            else:
+                data = response.json()
+                validators = {k: response.headers[k] for k in ("ETag", "Last-Modified") if k in response.headers}
+        except (httpx.HTTPError, ValueError) as e:
+            logging.warning(f"Request to {url} failed: {e}")
+
+        if data is None and cache_path and os.path.exists(cache_path):
+            logging.warning(f"Could not revalidate {cache_path}, using the cached copy")
+            return self.load_data(cache_path)
+
+        if data is None:
+            logging.info(f"Falling back to Selenium for {url}")
+            # A single WebDriver instance is shared, so fallback calls are serialized
+            with self._driver_lock:
+                data = self._call_using_selenium(endpoint)
+
+        payload = extract(data)
+        if cache_path:
+            self.save_data(payload, cache_path)
+            if validators:
+                self.save_data(validators, meta_path)
+            elif os.path.exists(meta_path):
+                os.remove(meta_path)
+        return payload
 
-    
     def _call_using_selenium(self, endpoint: str) -> Dict[str, Any]:
         """
         Uses Selenium to fetch the page source from a given URL.
@@ -40,21 +120,16 @@ class TennisDataFetcher:
         """
         url = self.base_url + endpoint
         
-        self.driver.get(url)
-        WebDriverWait(self.driver, 10).until(
+        driver = self._get_driver()
+        driver.get(url)
+        WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        body = soup.body
-        if body:
-            # Extract text from <pre> if present, else fallback to body text
-            pre = body.find('pre')
-            if pre:
-                body_content = pre.get_text()
-            else:
-                body_content = body.get_text()
-        else:
-            body_content = ''
+        # Chrome wraps JSON responses in a <pre>, else fallback to body text
+        try:
+            body_content = driver.find_element(By.TAG_NAME, "pre").text
+        except NoSuchElementException:
+            body_content = driver.execute_script("return document.body.innerText") or ''
         try:
             return json.loads(body_content)
         except json.JSONDecodeError as e:
@@ -78,58 +153,48 @@ class TennisDataFetcher:
         Returns a list of ATP tournaments with selected fields.
         Optionally saves the data if save_dir is provided.
         """
-        data = self._call_using_selenium(
-            endpoint="/config/default-unique-tournaments/NL/tennis"
+        def extract(data: Any) -> List[Dict[str, Any]]:
+            self._validate_response(data, ["uniqueTournaments"], context="get_tournaments")
+            tournaments = data.get("uniqueTournaments", [])
+            relevant_fields = ['name', 'slug', 'category', 'tennisPoints', 'id']
+            return [
+                {k: t.get(k) for k in relevant_fields}
+                for t in tournaments
+                if t.get("category", {}).get("name") == "ATP"
+            ]
+
+        tournaments_file = os.path.join(save_dir, "tournaments.json") if save_dir else None
+        return self._cached_get(
+            endpoint="/config/default-unique-tournaments/NL/tennis",
+            cache_path=tournaments_file,
+            extract=extract,
         )
-        self._validate_response(data, ["uniqueTournaments"], context="get_tournaments")
-        tournaments = data.get("uniqueTournaments", [])
-        relevant_fields = ['name', 'slug', 'category', 'tennisPoints', 'id']
-        filtered = [
-            {k: t.get(k) for k in relevant_fields}
-            for t in tournaments
-            if t.get("category", {}).get("name") == "ATP"
-        ]
-        if save_dir:
-            self.save_data(filtered, os.path.join(save_dir, "tournaments.json"))
-        return filtered
 
     def get_seasons(self, tournament_id: int, save_dir: str) -> List[Dict[str, Any]]:
         """
         Returns a list of seasons for a given tournament ID.
         Optionally saves the data if save_dir is provided.
         """
-        season_file = os.path.join(save_dir, f"seasons_{tournament_id}.json")
-        if os.path.exists(season_file):
-            with open(season_file, "r", encoding="utf-8") as f:
-                seasons = json.load(f)
-            return seasons
-        
+        def extract(data: Any) -> List[Dict[str, Any]]:
+            self._validate_response(data, ["seasons"], context="get_seasons")
+            return data.get("seasons", [])
+
+        season_file = os.path.join(save_dir, f"seasons_{tournament_id}.json") if save_dir else None
         endpoint = f"/unique-tournament/{tournament_id}/seasons"
-        data = self._call_using_selenium(endpoint=endpoint)
-        self._validate_response(data, ["seasons"], context="get_seasons")
-        seasons = data.get("seasons", [])
-        if save_dir:
-            self.save_data(seasons, os.path.join(save_dir, f"seasons_{tournament_id}.json"))
-        return seasons
+        return self._cached_get(endpoint=endpoint, cache_path=season_file, extract=extract)
 
     def get_cuptrees(self, tournament_id: int, season_id: int, save_dir: str) -> Dict[str, Any]:
         """
         Returns the cup trees for a specific tournament season.
         Optionally saves the data if save_dir is provided.
         """
-        cuptrees_file = os.path.join(save_dir, f"cuptrees_{tournament_id}_{season_id}.json")
-        if os.path.exists(cuptrees_file):
-            with open(cuptrees_file, "r", encoding="utf-8") as f:
-                cuptrees = json.load(f)
-            return cuptrees
-        
+        def extract(data: Any) -> Dict[str, Any]:
+            self._validate_response(data, ["cupTrees"], context="get_cuptrees")
+            return data.get("cupTrees", {})
+
+        cuptrees_file = os.path.join(save_dir, f"cuptrees_{tournament_id}_{season_id}.json") if save_dir else None
         endpoint = f"/unique-tournament/{tournament_id}/season/{season_id}/cuptrees"
-        data = self._call_using_selenium(endpoint=endpoint)
-        self._validate_response(data, ["cupTrees"], context="get_cuptrees")
-        cuptrees = data.get("cupTrees", {})
-        if save_dir:
-            self.save_data(cuptrees, os.path.join(save_dir, f"cuptrees_{tournament_id}_{season_id}.json"))
-        return cuptrees
+        return self._cached_get(endpoint=endpoint, cache_path=cuptrees_file, extract=extract)
 
     def get_players(self) -> List[Dict[str, Any]]:
         """
@@ -149,6 +214,13 @@ class TennisDataFetcher:
         except Exception as e:
             logging.error("Failed to save data to %s: %s", filename, e)
 
+    def load_data(self, filename: str) -> Any:
+        """
+        Loads JSON data from the given file.
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+
     def get_all_data(self, max_tournaments: Optional[int] = None, save_dir: str = os.path.join("data", "raw")) -> Dict[str, Any]:
         """
         Collects and saves data for up to max_tournaments ATP tournaments.
@@ -169,31 +241,41 @@ class TennisDataFetcher:
             tournaments = tournaments[:max_tournaments]
         all_data["tournaments"] = tournaments
 
-        for t in tournaments:
-            tid = t["id"]
-            try:
-                seasons = self.get_seasons(tid, save_dir=save_dir)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            season_futures = {
+                executor.submit(self.get_seasons, t["id"], save_dir=save_dir): t["id"]
+                for t in tournaments
+            }
+            cuptree_futures = {}
+            for future in as_completed(season_futures):
+                tid = season_futures[future]
+                try:
+                    seasons = future.result()
+                except Exception as e:
+                    logging.warning(f"Failed to get seasons for tournament {tid}: {e}")
+                    continue
                 all_data["seasons"][tid] = seasons
-                # time.sleep(1)  # Add delay between tournament requests
                 for season in seasons:
                     sid = season["id"]
-                    try:
-                        cuptrees = self.get_cuptrees(tid, sid, save_dir=save_dir)
-                        all_data["cuptrees"][(tid, sid)] = cuptrees
-                    except Exception as e:
-                        logging.warning(f"Failed to get cuptrees for tournament {tid} season {sid}: {e}")
-                    # time.sleep(1)  # Add delay between season requests
-            except Exception as e:
-                logging.warning(f"Failed to get seasons for tournament {tid}: {e}")
+                    cuptree_futures[executor.submit(self.get_cuptrees, tid, sid, save_dir=save_dir)] = (tid, sid)
+
+            for future in as_completed(cuptree_futures):
+                tid, sid = cuptree_futures[future]
+                try:
+                    all_data["cuptrees"][(tid, sid)] = future.result()
+                except Exception as e:
+                    logging.warning(f"Failed to get cuptrees for tournament {tid} season {sid}: {e}")
 
         return all_data
     
     def close(self):
         """
-        Closes the Selenium WebDriver.
+        Closes the HTTP client and the Selenium WebDriver.
         """
+        self.client.close()
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
     def __exit__(self):
         """
@@ -1,15 +1,53 @@
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import pandas as pd
-import json
+import numpy as np
+import orjson
 import os   
 import re
+from concurrent.futures import ThreadPoolExecutor
+from src.utils import downcast_frame
+
+# Scores in the format "0:3", "1:2", etc.
+SCORE_PATTERN = re.compile(r'^[0-3]:[0-3]$')
+QUALIFICATION_PATTERN = re.compile(r'qualification|qualifying', re.IGNORECASE)
+
+# Map round codes to simplified descriptions
+round_map = {
+    'R128': 'R128',
+    'R64': 'R64',
+    'R32': 'R32',
+    'R16': 'R16',
+    'Quarterfinals': 'QF',
+    'Quarterfinal': 'QF',
+    'Semifinals': 'SF',
+    'Semifinal': 'SF',
+    'Final': 'F',
+    '1/32': 'R32',
+    '1/16': 'R16',
+    '1/8': 'R8',
+    'Qualification': 'Q',
+    'Qualification round 1': 'Q',
+    'Qualification round 2': 'Q',
+    'Qualification Final': 'Q',
+    'Qualification final': 'Q',
+    'Round of 128': 'R128',
+    'Round of 64': 'R64',
+    'Round of 32': 'R32',
+    'Round of 16': 'R16',
+}
 
 class TennisDataProcessor:
     def __init__(self):
         pass
 
-    def process_cuptree_json(self, cuptree: Dict[str, Any]) -> pd.DataFrame:
+    def load_json(self, path: str) -> Any:
+        """Reads and parses a JSON file."""
+        logging.info(f"Processing cuptree file: {os.path.basename(path)}")
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def process_cuptree_json(self, cuptree: List[Dict[str, Any]]) -> pd.DataFrame:
         """Extracts relevant columns from a cuptree JSON into a DataFrame with error handling."""
         
         try:
@@ -48,7 +86,11 @@ class TennisDataProcessor:
                         team['teamSeed'] = participant.get('teamSeed', None)
                         participants_list.append(team)
         
-        return pd.DataFrame(participants_list)[['name', 'slug', 'shortName', 'gender', 'nameCode', 'ranking', 'disabled', 'national', 'id']].drop_duplicates()
+        participants_df = pd.DataFrame(participants_list)[['name', 'slug', 'shortName', 'gender', 'nameCode', 'ranking', 'disabled', 'national', 'id']]
+        participants_df = participants_df.astype({'gender': 'category', 'nameCode': 'category', 'national': 'category'})
+
+        # 'id' is the primary key, so only that column needs to be hashed
+        return participants_df.drop_duplicates(subset='id', keep='first')
                   
     def map_round_description(self, round_description: str) -> str:
         """
@@ -58,88 +100,86 @@ class TennisDataProcessor:
         if not round_description:
             return ""
         
-        if re.search(r'qualification|qualifying', round_description, re.IGNORECASE):
+        if QUALIFICATION_PATTERN.search(round_description):
             return 'Q'
         
-        # Map round codes to simplified descriptions
-        round_map = {
-            'R128': 'R128',
-            'R64': 'R64',
-            'R32': 'R32',
-            'R16': 'R16',
-            'Quarterfinals': 'QF',
-            'Quarterfinal': 'QF',
-            'Semifinals': 'SF',
-            'Semifinal': 'SF',
-            'Final': 'F',
-            '1/32': 'R32',
-            '1/16': 'R16',
-            '1/8': 'R8',
-            'Qualification': 'Q',
-            'Qualification round 1': 'Q',
-            'Qualification round 2': 'Q',
-            'Qualification Final': 'Q',
-            'Qualification final': 'Q',
-            'Round of 128': 'R128',
-            'Round of 64': 'R64',
-            'Round of 32': 'R32',
-            'Round of 16': 'R16',
-        }
         if round_description not in round_map:
             raise ValueError(f"Unknown round description: {round_description}")
         return round_map[round_description]
+
+    def map_round_descriptions(self, round_descriptions: pd.Series) -> pd.Series:
+        """
+        Vectorized counterpart of map_round_description for a whole Series.
+        Only the distinct descriptions are mapped, the result is gathered back by their codes.
+        Raises a ValueError if any round description is not recognized.
+        """
+        codes, uniques = pd.factorize(round_descriptions.fillna(''))
+        mapped = np.array([self.map_round_description(description) for description in uniques], dtype=object)
+        return pd.Series(mapped[codes], index=round_descriptions.index)
     
     def validate_score_format(self, score: str) -> bool:
-        # Define a regular expression pattern to match scores in the format "0:3", "1:2", etc.
-        pattern = re.compile(r'^[0-3]:[0-3]$')
-
-        if score and pattern.match(score):
+        if score and SCORE_PATTERN.match(score):
             return True
         else:
             return False
 
+    def participant_team_id(self, participants: List[Dict[str, Any]], position: int) -> Optional[int]:
+        """Returns the team id of the participant at the given position, or None if there is none."""
+        if len(participants) <= position:
+            return None
+        return participants[position].get('team', {}).get('id')
+
     def extract_games_from_cuptree(self, cuptrees: pd.DataFrame) -> pd.DataFrame:
         """
         Extracts and flattens all games from the 'rounds' column of the cuptree DataFrame.
         Returns a DataFrame with one row per game, including home and away participant IDs.
         """
-        games_list = []
-
-        for _, cuptree in cuptrees.iterrows():
-            tournamentName = cuptree['tournament']['name']
-            uniqueTournament = cuptree['tournament']['uniqueTournament']['name']
-            rounds = cuptree['rounds']
-            if not isinstance(rounds, list):
-                continue
-            for round_item in rounds:
-                round_description = round_item.get('description', {})
-                blocks = round_item.get('blocks', [])
-                for block in blocks:
-                    if block.get('result') and block.get('result').lower() in ['retired', 'walkover', '0:0']:
-                        continue
-                    elif block.get('result') in ['home won', 'away won', 'on-going']:
-                        block['result'] = block['homeTeamScore'] + ':' + block['awayTeamScore']
-                    if not self.validate_score_format(block.get('result')):
-                        logging.error(f"Invalid score format: {block.get('result')}")
-                    participants = block.get('participants', [])
-                    block_copy = block.copy()
-                    if len(participants) < 1:
-                        continue
-                    block_copy['home_id'] = participants[0]['team'].get('id')
-                    if len(participants) == 1:
-                        block_copy['away_id'] = None
-                    else:
-                        block_copy['away_id'] = participants[1]['team'].get('id')
-                    block_copy['round_description'] = self.map_round_description(round_description)
-                    block_copy['tournamentName'] = tournamentName
-                    block_copy['uniqueTournament'] = uniqueTournament
-                    
-                    games_list.append(block_copy)
-
-        if not games_list:
+        cuptrees = cuptrees[cuptrees['rounds'].map(lambda rounds: isinstance(rounds, list))]
+        if cuptrees.empty:
+            return pd.DataFrame()
+
+        records = [
+            {
+                'tournamentName': tournament['name'],
+                'uniqueTournament': tournament['uniqueTournament']['name'],
+                # json_normalize requires every round to have a 'blocks' list
+                'rounds': [{**round_item, 'blocks': round_item.get('blocks', [])} for round_item in rounds],
+            }
+            for tournament, rounds in zip(cuptrees['tournament'], cuptrees['rounds'])
+        ]
+        # Flatten all blocks of all rounds in one pass, carrying tournament and round info along
+        games_df = pd.json_normalize(
+            records,
+            record_path=['rounds', 'blocks'],
+            meta=['tournamentName', 'uniqueTournament', ['rounds', 'description']],
+            errors='ignore',
+        )
+        if games_df.empty or 'result' not in games_df.columns:
             return pd.DataFrame()
 
-        games_df = pd.json_normalize(games_list)
+        games_df = games_df[~games_df['result'].str.lower().isin(['retired', 'walkover', '0:0'])]
+
+        pending = games_df['result'].isin(['home won', 'away won', 'on-going'])
+        scores = games_df['homeTeamScore'].astype(str).str.cat(games_df['awayTeamScore'].astype(str), sep=':')
+        result = games_df['result'].mask(pending, scores)
+
+        valid_score = result.str.match(SCORE_PATTERN, na=False)
+        for score in result[~valid_score]:
+            logging.error(f"Invalid score format: {score}")
+
+        participants = games_df.get('participants', pd.Series(None, index=games_df.index, dtype=object))
+        participants = participants.map(lambda p: p if isinstance(p, list) else [])
+        has_participants = participants.map(len) >= 1
+        games_df = games_df.assign(result=result)[has_participants]
+        participants = participants[has_participants]
+        if games_df.empty:
+            return pd.DataFrame()
+
+        games_df = games_df.assign(
+            home_id=participants.map(lambda p: self.participant_team_id(p, 0)),
+            away_id=participants.map(lambda p: self.participant_team_id(p, 1)),
+            round_description=self.map_round_descriptions(games_df['rounds.description']),
+        ).reset_index(drop=True)
 
         games_df['seriesStartDate'] = pd.to_datetime(games_df.get('seriesStartDateTimestamp', None), unit='s', errors='coerce')
 
@@ -148,7 +188,7 @@ class TennisDataProcessor:
        'id', 'events', 'seriesStartDate',
        'home_id', 'away_id', 'round_description', 'tournamentName', 'uniqueTournament']]
     
-    def process_all_data(self, max_cuptrees: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    def process_all_data(self, max_cuptrees: Optional[int] = None, export_csv: bool = False) -> Dict[str, pd.DataFrame]:
         """
         Processes all cuptree JSON files and returns a dictionary with DataFrames for:
         - tournaments
@@ -157,36 +197,40 @@ class TennisDataProcessor:
 
         Args:
             max_cuptrees: Maximum number of cuptree files to process. If None, process all.
+            export_csv: Also export participants and games as CSV files next to the Parquet files.
         """
         data_dir = os.path.join('data', 'raw')
-        cuptree_files = [f for f in os.listdir(data_dir) if f.startswith('cuptrees') and f.endswith('.json')]
+        cuptree_files = [
+            f for f in os.listdir(data_dir)
+            if f.startswith('cuptrees') and f.endswith('.json') and not f.endswith('.meta.json')
+        ]
         if not cuptree_files:
             raise FileNotFoundError("No files starting with 'cuptrees' found in data/raw")
 
         if max_cuptrees is not None:
             cuptree_files = cuptree_files[:max_cuptrees]
 
-        participants_list = []
-        games_list = []
-
-        for cuptree_file in cuptree_files:
-            logging.info(f"Processing cuptree file: {cuptree_file}")
-            with open(os.path.join(data_dir, cuptree_file), 'r', encoding='utf-8') as f:
-                cuptree = json.load(f)
-            processed_cuptree = self.process_cuptree_json(cuptree)
-            participants_df = self.get_all_participants(processed_cuptree)
-            games_df = self.extract_games_from_cuptree(processed_cuptree)
-            participants_list.append(participants_df)
-            games_list.append(games_df)
-
-        participants_df = pd.concat(participants_list, ignore_index=True) if participants_list else pd.DataFrame()
-        games_df = pd.concat(games_list, ignore_index=True) if games_list else pd.DataFrame()
-
-        participants_df = participants_df.drop_duplicates().reset_index(drop=True)
-
-        # Save participants and games DataFrames separately as CSV files
-        participants_df.drop_duplicates().to_csv(os.path.join('data', 'processed', 'participants.csv'), index=False)
-        games_df.to_csv(os.path.join('data', 'processed', 'games.csv'), index=False)
+        # Collect the cup trees of all files first, so they are flattened in a single pass
+        cuptrees = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            paths = [os.path.join(data_dir, cuptree_file) for cuptree_file in cuptree_files]
+            for cuptree in executor.map(self.load_json, paths):
+                cuptrees.extend(cuptree)
+
+        processed_cuptrees = self.process_cuptree_json(cuptrees)
+        participants_df = downcast_frame(self.get_all_participants(processed_cuptrees).reset_index(drop=True))
+        games_df = downcast_frame(self.extract_games_from_cuptree(processed_cuptrees))
+
+        # Save participants and games DataFrames separately as Parquet files
+        processed_dir = os.path.join('data', 'processed')
+        participants_df.to_parquet(
+            os.path.join(processed_dir, 'participants.parquet'), engine='pyarrow', compression='zstd', index=False
+        )
+        games_df.to_parquet(os.path.join(processed_dir, 'games.parquet'), engine='pyarrow', compression='zstd', index=False)
+
+        if export_csv:
+            participants_df.to_csv(os.path.join(processed_dir, 'participants.csv'), index=False)
+            games_df.to_csv(os.path.join(processed_dir, 'games.csv'), index=False)
 
         return {
             "participants": participants_df,
@@ -3,6 +3,7 @@ import pandas as pd
 import logging
 from datetime import datetime
 import numpy as np 
+from src.utils import downcast_frame
 
 # TODO should be in config but for now stays here
 ordinal_mapping = {
@@ -19,6 +20,12 @@ ordinal_mapping = {
     'F': 11
 }
 
+SECONDS_PER_YEAR = int(365.25 * 24 * 60 * 60)
+
+# Cyclical month encoding indexed by month, index 0 holds NaN for missing dates
+MONTH_SIN = np.append(np.nan, np.sin(2 * np.pi * np.arange(1, 13) / 12)).astype(np.float32)
+MONTH_COS = np.append(np.nan, np.cos(2 * np.pi * np.arange(1, 13) / 12)).astype(np.float32)
+
 tournament_surfaces = {
     'Australian Open': 'Hard',
     'Roland Garros': 'Clay'
@@ -26,7 +33,7 @@ tournament_surfaces = {
 
 class FeatureBuilder:
     def __init__(self):
-        self.combined_data = pd.read_csv('data/processed/combined.csv')
+        self.combined_data = pd.read_parquet('data/processed/combined.parquet')
 
     def define_label(self, result: str) -> str:
         # Define the label
@@ -44,18 +51,26 @@ class FeatureBuilder:
         features = pd.DataFrame()
         features['id_home'] = data['id_home']
         features['id_away'] = data['id_away']
-        features['age_home'] = (pd.to_datetime(data['seriesStartDate']) - pd.to_datetime(data['birthdate_home'])).dt.days.div(365.25)
-        features['age_away'] = (pd.to_datetime(data['seriesStartDate']) - pd.to_datetime(data['birthdate_away'])).dt.days.div(365.25)
+        start = data['seriesStartDate'].to_numpy(dtype='datetime64[s]')
+        for side in ('home', 'away'):
+            birthdate = data[f'birthdate_{side}'].to_numpy(dtype='datetime64[s]')
+            features[f'age_{side}'] = ((start - birthdate) / np.timedelta64(SECONDS_PER_YEAR, 's')).astype(np.float32)
         return features
 
 
-    def build_features(self) -> pd.DataFrame:
+    def build_features(self, export_csv: bool = False) -> pd.DataFrame:
         # Extract relevant features from the combined data
-        data = self.combined_data.copy()
-        data.sort_values(by="seriesStartDate", inplace=True)
+        data = self.combined_data.sort_values(by="seriesStartDate")
         features = pd.DataFrame()
 
-        features['result'] = data['result'].apply(self.define_label) # train label
+        # train label
+        valid_result = data['result'].str.match(r'^\d+:\d+$', na=False)
+        if not valid_result.all():
+            invalid = data.loc[~valid_result, 'result'].iloc[0]
+            logging.error(f"Invalid result format: {invalid}")
+            raise ValueError(f"Invalid result format: {invalid}")
+        scores = data['result'].str.split(':', n=1, expand=True).astype(np.int16)
+        features['result'] = pd.Series(np.where(scores[0] > scores[1], 'home', 'away'), index=data.index)
 
         features = pd.concat([features, self.player_features(data)], axis=1)
 
@@ -65,18 +80,25 @@ class FeatureBuilder:
             logging.error(f"Unknown tournament surface: {e}")
             raise ValueError(f"Unknown tournament surface: {e}")
         try:
-            features['round_ordinal'] = data['round_description'].map(ordinal_mapping)
+            # Mapping a categorical round_description yields a categorical, keep the ordinal numeric
+            features['round_ordinal'] = data['round_description'].map(ordinal_mapping).astype(np.float32)
         except KeyError as e:
             logging.error(f"Unknown round description: {e}")
             raise ValueError(f"Unknown round description: {e}")
         
-        features['month'] = pd.to_datetime(data['seriesStartDate']).dt.month
-        features['month_sin'] = np.sin(2 * np.pi * features['month'] / 12)
-        features['month_cos'] = np.cos(2 * np.pi * features['month'] / 12)
+        features['month'] = data['seriesStartDate'].dt.month
+        month_idx = features['month'].fillna(0).to_numpy(dtype=np.intp)
+        features['month_sin'] = MONTH_SIN[month_idx]
+        features['month_cos'] = MONTH_COS[month_idx]
 
-        features = pd.get_dummies(features, columns=['month', 'surface'])
+        # Left as categoricals for XGBoost's native categorical support instead of one-hot encoding
+        features['month'] = features['month'].astype('category')
+        features['surface'] = features['surface'].astype('category')
 
-        features.to_csv('data/processed/features.csv', index=False)
+        features = downcast_frame(features)
+        features.to_parquet('data/processed/features.parquet', engine='pyarrow', compression='zstd', index=False)
+        if export_csv:
+            features.to_csv('data/processed/features.csv', index=False)
         return features
     
 if __name__ == "__main__":
@@ -1,30 +1,74 @@
 # modeling/model_trainer.py
+import json
+import logging
+import warnings
 import xgboost as xgb
 from sklearn.metrics import classification_report
 
 import pandas as pd
+import numpy as np
 from sklearn.model_selection import GroupShuffleSplit
 
 import joblib
 
+def cuda_available() -> bool:
+    """Checks whether XGBoost can train on a CUDA device, by training a single tree on one."""
+    if not xgb.build_info().get('USE_CUDA', False):
+        return False
+    try:
+        with warnings.catch_warnings():
+            # Without a visible GPU XGBoost only warns and silently trains on the CPU
+            warnings.simplefilter('ignore')
+            booster = xgb.train(
+                {'device': 'cuda', 'tree_method': 'hist'},
+                xgb.DMatrix(np.zeros((2, 1)), label=[0, 1]),
+                num_boost_round=1
+            )
+    except xgb.core.XGBoostError:
+        return False
+    return json.loads(booster.save_config())['learner']['generic_param']['device'].startswith('cuda')
+
 class ModelTrainer:
     def __init__(self):
-        self.model = xgb.XGBClassifier()
-        self.features = pd.read_csv('data/processed/features.csv') 
+        device = 'cuda' if cuda_available() else 'cpu'
+        logging.info(f"Training on {device}")
+        self.model = xgb.XGBClassifier(
+            tree_method='hist',
+            device=device,
+            enable_categorical=True,
+            n_estimators=2000,
+            early_stopping_rounds=50,
+            eval_metric='logloss',
+            n_jobs=-1
+        )
+        self.features = pd.read_parquet('data/processed/features.parquet') 
+        # Parquet only restores string categoricals, so month comes back as a plain number
+        self.features = self.features.astype({'month': 'category', 'surface': 'category'})
 
     def train_model(self):
         # Prepare features and label
         X = self.features.drop(columns=['result', 'id_home', 'id_away'])
         y = self.features['result']
-        y = y.map({'away': 0, 'home': 1})
+        y = y.map({'away': 0, 'home': 1}).astype(np.int8)
+
+        # Group by player pair: pack both 32-bit ids into a single int64 key
+        id_home = self.features['id_home'].to_numpy(dtype=np.int64)
+        id_away = self.features['id_away'].to_numpy(dtype=np.int64)
+        groups = (id_home << 32) | (id_away & 0xFFFFFFFF)
 
         gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
-        train_idx, test_idx= next(gss.split(X, y, groups=self.features[['id_home', 'id_away']].apply(tuple, axis=1)))
+        train_idx, test_idx= next(gss.split(X, y, groups=groups))
 
         X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
         y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
 
-        self.model.fit(X_train, y_train)
+        # Early stopping uses a validation split of the training groups, the test split is only for evaluation
+        val_gss = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+        fit_idx, val_idx = next(val_gss.split(X_train, y_train, groups=groups[train_idx]))
+        X_fit, X_val = X_train.iloc[fit_idx], X_train.iloc[val_idx]
+        y_fit, y_val = y_train.iloc[fit_idx], y_train.iloc[val_idx]
+
+        self.model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
         y_pred = self.model.predict(X_test)
         print(classification_report(y_test, y_pred))
         return self.model
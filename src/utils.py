@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def downcast_frame(df: pd.DataFrame, max_category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Shrinks a DataFrame before it is saved: integers and floats are downcast to the
+    smallest dtype that holds their values, and low-cardinality string columns become
+    categoricals.
+
+    Args:
+        df: The DataFrame to compact.
+        max_category_ratio: String columns with fewer unique values than this fraction
+            of the rows are converted to categoricals.
+    """
+    columns = {}
+    for col in df.select_dtypes('integer').columns:
+        columns[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes('float').columns:
+        downcast = pd.to_numeric(df[col], downcast='float')
+        # Only keep float32 if no precision is lost (e.g. ids stored as float because of NaNs)
+        if np.array_equal(downcast.to_numpy(dtype=np.float64), df[col].to_numpy(dtype=np.float64), equal_nan=True):
+            columns[col] = downcast
+    for col in df.select_dtypes('object').columns:
+        # Skip columns holding lists or mixed values, which cannot be hashed or categorized
+        if pd.api.types.infer_dtype(df[col], skipna=True) != 'string':
+            continue
+        if len(df) and df[col].nunique() / len(df) < max_category_ratio:
+            columns[col] = df[col].astype('category')
+    return df.assign(**columns)
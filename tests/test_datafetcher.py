@@ -0,0 +1,50 @@
+import json
+
+import httpx
+
+from src.datafetcher import TennisDataFetcher
+
+
+def make_fetcher(handler):
+    fetcher = TennisDataFetcher()
+    fetcher.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+def write_cache(tmp_path, seasons):
+    (tmp_path / "seasons_1.json").write_text(json.dumps(seasons))
+    (tmp_path / "seasons_1.meta.json").write_text(json.dumps({"ETag": '"abc"'}))
+
+
+def test_cached_copy_is_returned_when_unchanged(tmp_path):
+    write_cache(tmp_path, [{"id": 10}])
+
+    def handler(request):
+        assert request.headers["If-None-Match"] == '"abc"'
+        return httpx.Response(304)
+
+    assert make_fetcher(handler).get_seasons(1, save_dir=str(tmp_path)) == [{"id": 10}]
+
+
+def test_cached_copy_is_returned_when_revalidation_fails(tmp_path):
+    write_cache(tmp_path, [{"id": 10}])
+
+    def offline(request):
+        raise httpx.ConnectError("offline", request=request)
+
+    def blocked(request):
+        return httpx.Response(403, text="<html>challenge</html>")
+
+    for handler in (offline, blocked):
+        fetcher = make_fetcher(handler)
+        assert fetcher.get_seasons(1, save_dir=str(tmp_path)) == [{"id": 10}]
+        assert fetcher.driver is None
+
+
+def test_response_and_validators_are_cached(tmp_path):
+    def handler(request):
+        return httpx.Response(200, json={"seasons": [{"id": 20}]}, headers={"ETag": '"def"'})
+
+    assert make_fetcher(handler).get_seasons(1, save_dir=str(tmp_path)) == [{"id": 20}]
+    assert json.loads((tmp_path / "seasons_1.json").read_text()) == [{"id": 20}]
+    assert json.loads((tmp_path / "seasons_1.meta.json").read_text()) == {"ETag": '"def"'}
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from src.dataprocessor import TennisDataProcessor
+
+
+def make_block(block_id, participants, result='3:1'):
+    block = {
+        'finished': True,
+        'result': result,
+        'homeTeamScore': result.split(':')[0],
+        'awayTeamScore': result.split(':')[1],
+        'id': block_id,
+        'events': [block_id],
+        'seriesStartDateTimestamp': 1700000000,
+    }
+    if participants is not None:
+        block['participants'] = [{'team': {'id': team_id}} for team_id in participants]
+    return block
+
+
+def make_cuptrees(rounds):
+    return pd.DataFrame([{
+        'id': 1,
+        'name': 'Australian Open',
+        'tournament': {'name': 'Australian Open', 'uniqueTournament': {'name': 'Australian Open'}},
+        'rounds': rounds,
+    }])
+
+
+def test_extract_games_skips_rounds_without_blocks():
+    cuptrees = make_cuptrees([
+        {'description': 'Round of 16'},
+        {'description': 'Final', 'blocks': [make_block(1, [10, 20])]},
+    ])
+
+    games = TennisDataProcessor().extract_games_from_cuptree(cuptrees)
+
+    assert games['id'].tolist() == [1]
+    assert games['round_description'].tolist() == ['F']
+
+
+def test_extract_games_skips_blocks_without_participants():
+    processor = TennisDataProcessor()
+
+    games = processor.extract_games_from_cuptree(make_cuptrees([
+        {'description': 'Final', 'blocks': [make_block(1, None), make_block(2, [10, 20])]},
+    ]))
+    assert games['id'].tolist() == [2]
+    assert games[['home_id', 'away_id']].values.tolist() == [[10, 20]]
+
+    games = processor.extract_games_from_cuptree(make_cuptrees([
+        {'description': 'Final', 'blocks': [make_block(1, None)]},
+    ]))
+    assert games.empty
+
+
+def test_extract_games_without_second_participant():
+    cuptrees = make_cuptrees([
+        {'description': 'Final', 'blocks': [make_block(1, [10]), make_block(2, [30])]},
+    ])
+
+    games = TennisDataProcessor().extract_games_from_cuptree(cuptrees)
+
+    assert games['home_id'].tolist() == [10, 30]
+    assert games['away_id'].isna().all()